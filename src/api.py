@@ -153,6 +153,7 @@ from src.store import (
     add_documents,
     delete_document_chunks,
     doc_count,
+    reset_vectorstore,
     search_content,
     upsert_item,
     upsert_markdown,
@@ -1574,6 +1575,8 @@ async def api_restore(file: UploadFile):
         raise HTTPException(status_code=400, detail=f"Invalid backup file: {e}")
     finally:
         tmp_path.unlink(missing_ok=True)
+        # Even a failed restore may already have replaced the Chroma files
+        reset_vectorstore()
 
     return {
         "ok": True,
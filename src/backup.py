@@ -8,10 +8,13 @@ Creates a ZIP archive containing:
 """
 
 import shutil
+import sqlite3
 import tempfile
 import zipfile
 from pathlib import Path
 
+from src.markdowns import close_connections
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
 DB_PATH = DATA_DIR / "astro.db"
@@ -20,6 +23,22 @@ DOCUMENTS_DIR = BASE_DIR / "documents"
 CHROMA_DIR = DATA_DIR / "chroma"
 
 
+def _snapshot_db(dest: Path) -> None:
+    """Copy a consistent snapshot of astro.db, including its write-ahead log, to ``dest``.
+
+    Uses SQLite's online backup API rather than checkpointing and copying
+    the file: a checkpoint can't complete while other connections are
+    reading or writing, and committed pages would then be left out.
+    """
+    src = sqlite3.connect(str(DB_PATH))
+    dst = sqlite3.connect(str(dest))
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
 def _dir_size(path: Path) -> tuple[int, int]:
     """Return (total_bytes, file_count) for a directory tree."""
     total = 0
@@ -65,7 +84,10 @@ def create_backup(dest: Path | None = None) -> Path:
     with zipfile.ZipFile(dest, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
         # 1. SQLite database
         if DB_PATH.is_file():
-            zf.write(DB_PATH, "astro.db")
+            with tempfile.TemporaryDirectory(prefix="astro-backup-") as tmp_dir:
+                snapshot = Path(tmp_dir) / "astro.db"
+                _snapshot_db(snapshot)
+                zf.write(snapshot, "astro.db")
 
         # 2. Markdown images
         if IMAGES_DIR.is_dir():
@@ -106,6 +128,11 @@ def restore_backup(zip_path: Path) -> dict:
         # 1. Restore database
         if "astro.db" in names:
             DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+            # Open handles would keep reading the old file (and its WAL index)
+            close_connections()
+            # A leftover WAL from the old database would be replayed over the restored one
+            for suffix in ("-wal", "-shm"):
+                DB_PATH.with_name(DB_PATH.name + suffix).unlink(missing_ok=True)
             with zf.open("astro.db") as src, open(DB_PATH, "wb") as dst:
                 shutil.copyfileobj(src, dst)
             summary["db"] = True
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 
 from src.markdowns import _get_conn, _now, get_markdown
 
@@ -62,11 +62,11 @@ def _row_to_markdown_link(row) -> DashboardMarkdownLink:
 
 
 def widget_to_dict(w: DashboardWidget) -> dict:
-    return asdict(w)
+    return vars(w).copy()
 
 
 def markdown_link_to_dict(link: DashboardMarkdownLink) -> dict:
-    return asdict(link)
+    return vars(link).copy()
 
 
 def _normalize_column(column_index: int) -> int:
@@ -262,20 +262,23 @@ def reorder_dashboard_widgets(
 
     now = _now()
     conn = _get_conn()
-    for item in placements:
-        tag = _normalize_tag(str(item.get("tag", "")))
-        col = _normalize_column(int(item.get("column_index", 0)))
-        order = int(item.get("sort_order", 0))
-        conn.execute(
-            """
-            UPDATE dashboard_widgets
-            SET column_index = ?, sort_order = ?, updated_at = ?
-            WHERE universe_id = ? AND tag = ?
-            """,
-            (col, order, now, universe_id, tag),
-        )
-    conn.commit()
-    conn.close()
+    try:
+        # Commit all placements or, if one is malformed, none of them
+        with conn:
+            for item in placements:
+                tag = _normalize_tag(str(item.get("tag", "")))
+                col = _normalize_column(int(item.get("column_index", 0)))
+                order = int(item.get("sort_order", 0))
+                conn.execute(
+                    """
+                    UPDATE dashboard_widgets
+                    SET column_index = ?, sort_order = ?, updated_at = ?
+                    WHERE universe_id = ? AND tag = ?
+                    """,
+                    (col, order, now, universe_id, tag),
+                )
+    finally:
+        conn.close()
     return list_dashboard_widgets(universe_id)
 
 
@@ -452,38 +455,38 @@ def reorder_dashboard_items(
 
     now = _now()
     conn = _get_conn()
-    for item in placements:
-        item_type = str(item.get("type", "")).strip().lower()
-        col = _normalize_column(int(item.get("column_index", 0)))
-        order = int(item.get("sort_order", 0))
-        if item_type == "widget":
-            tag = _normalize_tag(str(item.get("tag", "")))
-            conn.execute(
-                """
-                UPDATE dashboard_widgets
-                SET column_index = ?, sort_order = ?, updated_at = ?
-                WHERE universe_id = ? AND tag = ?
-                """,
-                (col, order, now, universe_id, tag),
-            )
-        elif item_type in ("markdown_link", "markdown", "link"):
-            link_id = int(item.get("id", 0))
-            if not link_id:
-                conn.close()
-                raise ValueError("markdown_link placements require id")
-            conn.execute(
-                """
-                UPDATE dashboard_markdown_links
-                SET column_index = ?, sort_order = ?, updated_at = ?
-                WHERE universe_id = ? AND id = ?
-                """,
-                (col, order, now, universe_id, link_id),
-            )
-        else:
-            conn.close()
-            raise ValueError(f"Unknown dashboard item type: {item_type!r}")
-    conn.commit()
-    conn.close()
+    try:
+        with conn:
+            for item in placements:
+                item_type = str(item.get("type", "")).strip().lower()
+                col = _normalize_column(int(item.get("column_index", 0)))
+                order = int(item.get("sort_order", 0))
+                if item_type == "widget":
+                    tag = _normalize_tag(str(item.get("tag", "")))
+                    conn.execute(
+                        """
+                        UPDATE dashboard_widgets
+                        SET column_index = ?, sort_order = ?, updated_at = ?
+                        WHERE universe_id = ? AND tag = ?
+                        """,
+                        (col, order, now, universe_id, tag),
+                    )
+                elif item_type in ("markdown_link", "markdown", "link"):
+                    link_id = int(item.get("id", 0))
+                    if not link_id:
+                        raise ValueError("markdown_link placements require id")
+                    conn.execute(
+                        """
+                        UPDATE dashboard_markdown_links
+                        SET column_index = ?, sort_order = ?, updated_at = ?
+                        WHERE universe_id = ? AND id = ?
+                        """,
+                        (col, order, now, universe_id, link_id),
+                    )
+                else:
+                    raise ValueError(f"Unknown dashboard item type: {item_type!r}")
+    finally:
+        conn.close()
     return {
         "widgets": [widget_to_dict(w) for w in list_dashboard_widgets(universe_id)],
         "markdown_links": [
@@ -1,9 +1,13 @@
 """SQLite-backed markdowns, document-metadata, and category storage."""
 
+import atexit
 import json
 import sqlite3
+import threading
 import uuid
-from dataclasses import asdict, dataclass
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -75,12 +79,66 @@ IMAGES_DIR = Path(__file__).resolve().parent.parent / "data" / "images"
 _schema_ready = False
 
 
+class _PooledConnection(sqlite3.Connection):
+    """A connection that outlives the calls using it.
+
+    Callers still ``close()`` it when they're done; that hands it back by
+    discarding any uncommitted work, the same as closing a fresh connection
+    would, but keeps the handle (and SQLite's page cache) open.
+    """
+
+    def execute(self, sql, parameters=(), /):
+        try:
+            return super().execute(sql, parameters)
+        except sqlite3.Error:
+            # Don't let a failed write keep holding the database write lock
+            if self.in_transaction:
+                self.rollback()
+            raise
+
+    def executemany(self, sql, seq_of_parameters, /):
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        except sqlite3.Error:
+            if self.in_transaction:
+                self.rollback()
+            raise
+
+    def close(self) -> None:
+        if self.in_transaction:
+            self.rollback()
+
+
+# One connection per thread; the WeakSet lets close_connections() reach them
+# all without keeping connections of finished threads alive.
+_local = threading.local()
+_pool: "weakref.WeakSet[_PooledConnection]" = weakref.WeakSet()
+_pool_lock = threading.Lock()
+
+
 def _get_conn() -> sqlite3.Connection:
     global _schema_ready
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        # A caller that raised between a write and commit() never reached
+        # close(); drop its partial work so it isn't committed by the next
+        # caller (and the write lock isn't held meanwhile).
+        if conn.in_transaction:
+            conn.rollback()
+        return conn
+
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
+    conn = sqlite3.connect(
+        str(DB_PATH), factory=_PooledConnection, check_same_thread=False, cached_statements=256
+    )
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
+    # Per-connection settings (journal_mode = WAL is persisted by run_migrations)
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA busy_timeout = 5000")
+    conn.execute("PRAGMA cache_size = -16384")  # 16 MiB per thread
+    conn.execute("PRAGMA mmap_size = 268435456")  # 256 MiB
 
     if not _schema_ready:
         from src.migrate import run_migrations
@@ -88,9 +146,31 @@ def _get_conn() -> sqlite3.Connection:
         run_migrations(conn)
         _schema_ready = True
 
+    with _pool_lock:
+        _pool.add(conn)
+    _local.conn = conn
     return conn
 
 
+def close_connections() -> None:
+    """Close every pooled connection, e.g. before the database file is replaced.
+
+    Threads open a new connection on their next call, migrations are
+    checked again in case the file now holds an older schema, and cached
+    settings and category trees are dropped.
+    """
+    global _local, _schema_ready
+    with _pool_lock:
+        for conn in list(_pool):
+            sqlite3.Connection.close(conn)
+        _pool.clear()
+        _local = threading.local()
+        _schema_ready = False
+    _settings_cache.clear()
+    _category_tree_changed()
+
+
+atexit.register(close_connections)
 
 
 def _now() -> str:
@@ -106,9 +186,10 @@ def _row_to_universe(row: sqlite3.Row) -> Universe:
 
 def list_universes() -> list[Universe]:
     conn = _get_conn()
-    rows = conn.execute("SELECT * FROM universes ORDER BY id").fetchall()
+    rows = conn.execute("SELECT * FROM universes ORDER BY id")
+    universes = list(map(_row_to_universe, rows))
     conn.close()
-    return [_row_to_universe(r) for r in rows]
+    return universes
 
 
 def get_universe(uid: int) -> Universe | None:
@@ -134,21 +215,21 @@ def create_universe(name: str) -> Universe:
 def rename_universe(uid: int, name: str) -> Universe | None:
     now = _now()
     conn = _get_conn()
-    cur = conn.execute("UPDATE universes SET name = ?, updated_at = ? WHERE id = ?", (name, now, uid))
+    row = conn.execute(
+        "UPDATE universes SET name = ?, updated_at = ? WHERE id = ? RETURNING *", (name, now, uid)
+    ).fetchone()
     conn.commit()
-    if cur.rowcount == 0:
-        conn.close()
-        return None
-    row = conn.execute("SELECT * FROM universes WHERE id = ?", (uid,)).fetchone()
     conn.close()
-    return _row_to_universe(row)
+    return _row_to_universe(row) if row else None
 
 
 def delete_universe(uid: int) -> bool:
     """Delete a universe and all its content. Returns False if it's the last universe."""
     conn = _get_conn()
-    count = conn.execute("SELECT COUNT(*) FROM universes").fetchone()[0]
-    if count <= 1:
+    # Take the write lock before checking so the check and the deletes are one transaction
+    conn.execute("BEGIN IMMEDIATE")
+    other = conn.execute("SELECT 1 FROM universes WHERE id != ? LIMIT 1", (uid,)).fetchone()
+    if other is None:
         conn.close()
         return False
     conn.execute("DELETE FROM dashboard_markdown_links WHERE universe_id = ?", (uid,))
@@ -163,6 +244,7 @@ def delete_universe(uid: int) -> bool:
     conn.execute("DELETE FROM categories WHERE universe_id = ?", (uid,))
     conn.execute("DELETE FROM universes WHERE id = ?", (uid,))
     conn.commit()
+    _category_tree_changed()
     conn.close()
     return True
 
@@ -182,7 +264,7 @@ def get_universe_document_paths(uid: int) -> list[str]:
 
 
 def universe_to_dict(u: Universe) -> dict:
-    return asdict(u)
+    return vars(u).copy()
 
 
 # ── Categories CRUD ───────────────────────────────────────────────────────
@@ -215,13 +297,14 @@ def list_categories(universe_id: int | None = None) -> list[Category]:
         rows = conn.execute(
             "SELECT * FROM categories WHERE universe_id = ? ORDER BY sort_order, name",
             (universe_id,),
-        ).fetchall()
+        )
     else:
         rows = conn.execute(
             "SELECT * FROM categories ORDER BY universe_id, sort_order, name"
-        ).fetchall()
+        )
+    categories = list(map(_row_to_category, rows))
     conn.close()
-    return [_row_to_category(r) for r in rows]
+    return categories
 
 
 def create_category(name: str, parent_id: int | None = None, universe_id: int = 1, emoji: str | None = None) -> Category:
@@ -242,6 +325,7 @@ def create_category(name: str, parent_id: int | None = None, universe_id: int =
         (name, parent_id, universe_id, emoji, next_order),
     )
     conn.commit()
+    _category_tree_changed()
     cat_id = cur.lastrowid
     row = conn.execute(
         "SELECT * FROM categories WHERE id = ?",
@@ -266,15 +350,8 @@ def update_category(cat_id: int, name: str | None = None, emoji: str | None = ..
         conn.close()
         return None
     params.append(cat_id)
-    cur = conn.execute(f"UPDATE categories SET {', '.join(fields)} WHERE id = ?", params)
+    row = conn.execute(f"UPDATE categories SET {', '.join(fields)} WHERE id = ? RETURNING *", params).fetchone()
     conn.commit()
-    if cur.rowcount == 0:
-        conn.close()
-        return None
-    row = conn.execute(
-        "SELECT * FROM categories WHERE id = ?",
-        (cat_id,),
-    ).fetchone()
     conn.close()
     return _row_to_category(row) if row else None
 
@@ -283,6 +360,7 @@ def delete_category(cat_id: int) -> bool:
     conn = _get_conn()
     cur = conn.execute("DELETE FROM categories WHERE id = ?", (cat_id,))
     conn.commit()
+    _category_tree_changed()
     conn.close()
     return cur.rowcount > 0
 
@@ -399,6 +477,7 @@ def move_category_to_root(cat_id: int) -> Category | None:
         )
         clear_category_browse_positions(cat_id, conn=conn)
         conn.commit()
+        _category_tree_changed()
 
     row = conn.execute(
         "SELECT * FROM categories WHERE id = ?",
@@ -474,6 +553,7 @@ def move_category_to_parent(cat_id: int, parent_id: int | None) -> Category | No
     )
     clear_category_browse_positions(cat_id, conn=conn)
     conn.commit()
+    _category_tree_changed()
     row = conn.execute("SELECT * FROM categories WHERE id = ?", (cat_id,)).fetchone()
     conn.close()
     return _row_to_category(row) if row else None
@@ -640,49 +720,88 @@ def list_pinned_categories(universe_id: int | None = None) -> list[Category]:
         rows = conn.execute(
             "SELECT * FROM categories WHERE pinned = 1 AND universe_id = ? ORDER BY sort_order, name",
             (universe_id,),
-        ).fetchall()
+        )
     else:
         rows = conn.execute(
             "SELECT * FROM categories WHERE pinned = 1 ORDER BY universe_id, sort_order, name"
-        ).fetchall()
+        )
+    categories = list(map(_row_to_category, rows))
     conn.close()
-    return [_row_to_category(r) for r in rows]
+    return categories
+
+
+# category_id -> itself plus descendants.  Cleared by _category_tree_changed()
+# after every write that adds, removes or re-parents categories; the version
+# keeps a lookup that raced such a write from caching its stale result.
+_descendants_cache: dict[int, frozenset[int]] = {}
+_category_tree_version = 0
+
+
+def _category_tree_changed() -> None:
+    global _category_tree_version
+    _category_tree_version += 1
+    _descendants_cache.clear()
+
+
+def _sync_caches(conn: sqlite3.Connection) -> None:
+    """Drop cached settings and category trees if the database changed elsewhere.
+
+    PRAGMA data_version moves whenever another connection — another thread,
+    another instance sharing the file, or a hand edit — commits.  A
+    connection seen for the first time hasn't recorded one yet, so it
+    clears the caches too.
+    """
+    version = conn.execute("PRAGMA data_version").fetchone()[0]
+    if getattr(conn, "data_version", None) != version:
+        conn.data_version = version
+        _settings_cache.clear()
+        _category_tree_changed()
 
 
 def get_descendant_ids(category_id: int) -> set[int]:
     """Return category_id plus all its descendant IDs."""
     conn = _get_conn()
-    all_cats = conn.execute("SELECT id, parent_id FROM categories").fetchall()
+    _sync_caches(conn)
+    cached = _descendants_cache.get(category_id)
+    if cached is not None:
+        conn.close()
+        return set(cached)
+    version = _category_tree_version
+    rows = conn.execute(
+        "WITH RECURSIVE d(id) AS ("
+        " SELECT ? UNION SELECT c.id FROM categories c JOIN d ON c.parent_id = d.id"
+        ") SELECT id FROM d",
+        (category_id,),
+    ).fetchall()
     conn.close()
-    ids = {category_id}
-    changed = True
-    while changed:
-        changed = False
-        for r in all_cats:
-            if r["parent_id"] in ids and r["id"] not in ids:
-                ids.add(r["id"])
-                changed = True
+    ids = {r[0] for r in rows}
+    if version == _category_tree_version:
+        _descendants_cache[category_id] = frozenset(ids)
     return ids
 
 
 def category_to_dict(cat: Category) -> dict:
-    return asdict(cat)
+    return vars(cat).copy()
 
 
 # ── Markdowns CRUD ──────────────────────────────────────────────────────────
 
 
+# Selected in Markdown field order so rows unpack by position
+_MARKDOWN_COLUMNS = "id, title, body, category_id, pinned, created_at, updated_at, universe_id"
+
+
 def _row_to_markdown(row: sqlite3.Row) -> Markdown:
-    return Markdown(
-        id=row["id"],
-        title=row["title"],
-        body=row["body"],
-        category_id=row["category_id"],
-        pinned=bool(row["pinned"]),
-        created_at=row["created_at"],
-        updated_at=row["updated_at"],
-        universe_id=row["universe_id"],
-    )
+    mid, title, body, category_id, pinned, created_at, updated_at, universe_id = row
+    return Markdown(mid, title, body, category_id, bool(pinned), created_at, updated_at, universe_id)
+
+
+def _fts_phrase(query: str) -> str:
+    """Quote a search string as one FTS5 phrase (substring match under the trigram tokenizer).
+
+    Trigram matching needs at least three characters; shorter queries use LIKE.
+    """
+    return '"' + query.replace('"', '""') + '"'
 
 
 def list_markdowns(query: str = "", category_id: int | None = None, universe_id: int | None = None) -> list[Markdown]:
@@ -692,23 +811,26 @@ def list_markdowns(query: str = "", category_id: int | None = None, universe_id:
     if universe_id is not None:
         conditions.append("universe_id = ?")
         params.append(universe_id)
-    if query:
+    if len(query) >= 3:
+        conditions.append("id IN (SELECT rowid FROM markdowns_fts WHERE markdowns_fts MATCH ?)")
+        params.append(_fts_phrase(query))
+    elif query:
         conditions.append("(title LIKE ? OR body LIKE ?)")
         params += [f"%{query}%", f"%{query}%"]
     if category_id is not None:
         ids = get_descendant_ids(category_id)
-        placeholders = ",".join("?" * len(ids))
-        conditions.append(f"category_id IN ({placeholders})")
-        params.extend(ids)
+        conditions.append("category_id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps(sorted(ids)))
     where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
-    rows = conn.execute(f"SELECT * FROM markdowns{where} ORDER BY updated_at DESC", params).fetchall()
+    rows = conn.execute(f"SELECT {_MARKDOWN_COLUMNS} FROM markdowns{where} ORDER BY updated_at DESC", params)
+    markdowns = list(map(_row_to_markdown, rows))
     conn.close()
-    return [_row_to_markdown(r) for r in rows]
+    return markdowns
 
 
 def get_markdown(markdown_id: int) -> Markdown | None:
     conn = _get_conn()
-    row = conn.execute("SELECT * FROM markdowns WHERE id = ?", (markdown_id,)).fetchone()
+    row = conn.execute(f"SELECT {_MARKDOWN_COLUMNS} FROM markdowns WHERE id = ?", (markdown_id,)).fetchone()
     conn.close()
     return _row_to_markdown(row) if row else None
 
@@ -723,21 +845,19 @@ def create_markdown(title: str, body: str, category_id: int | None = None, unive
     conn.commit()
     nid = cur.lastrowid
     conn.close()
-    return get_markdown(nid)  # type: ignore[return-value]
+    return Markdown(id=nid, title=title, body=body, category_id=category_id, pinned=False, created_at=now, updated_at=now, universe_id=universe_id)
 
 
 def update_markdown(markdown_id: int, title: str, body: str, category_id: int | None = None) -> Markdown | None:
     now = _now()
     conn = _get_conn()
-    cur = conn.execute(
-        "UPDATE markdowns SET title = ?, body = ?, category_id = ?, updated_at = ? WHERE id = ?",
+    row = conn.execute(
+        f"UPDATE markdowns SET title = ?, body = ?, category_id = ?, updated_at = ? WHERE id = ? RETURNING {_MARKDOWN_COLUMNS}",
         (title, body, category_id, now, markdown_id),
-    )
+    ).fetchone()
     conn.commit()
     conn.close()
-    if cur.rowcount == 0:
-        return None
-    return get_markdown(markdown_id)
+    return _row_to_markdown(row) if row else None
 
 
 def delete_markdown(markdown_id: int) -> bool:
@@ -750,7 +870,7 @@ def delete_markdown(markdown_id: int) -> bool:
 
 
 def markdown_to_dict(markdown: Markdown) -> dict:
-    return asdict(markdown)
+    return vars(markdown).copy()
 
 
 # ── Document metadata ─────────────────────────────────────────────────────
@@ -796,20 +916,21 @@ def delete_document_meta(path: str) -> None:
 def get_all_document_categories() -> dict[str, int | None]:
     """Return {path: category_id} for all documents with metadata."""
     conn = _get_conn()
-    rows = conn.execute("SELECT path, category_id FROM document_meta").fetchall()
+    categories = {r["path"]: r["category_id"] for r in conn.execute("SELECT path, category_id FROM document_meta")}
     conn.close()
-    return {r["path"]: r["category_id"] for r in rows}
+    return categories
 
 
 def get_all_document_meta(universe_id: int | None = None) -> dict[str, dict]:
     """Return {path: {category_id, pinned, universe_id}} for documents, optionally filtered by universe."""
     conn = _get_conn()
     if universe_id is not None:
-        rows = conn.execute("SELECT path, category_id, pinned, universe_id FROM document_meta WHERE universe_id = ?", (universe_id,)).fetchall()
+        rows = conn.execute("SELECT path, category_id, pinned, universe_id FROM document_meta WHERE universe_id = ?", (universe_id,))
     else:
-        rows = conn.execute("SELECT path, category_id, pinned, universe_id FROM document_meta").fetchall()
+        rows = conn.execute("SELECT path, category_id, pinned, universe_id FROM document_meta")
+    meta = {r["path"]: {"category_id": r["category_id"], "pinned": bool(r["pinned"]), "universe_id": r["universe_id"]} for r in rows}
     conn.close()
-    return {r["path"]: {"category_id": r["category_id"], "pinned": bool(r["pinned"]), "universe_id": r["universe_id"]} for r in rows}
+    return meta
 
 
 def set_markdown_pinned(markdown_id: int, pinned: bool) -> bool:
@@ -823,11 +944,12 @@ def set_markdown_pinned(markdown_id: int, pinned: bool) -> bool:
 def list_pinned_markdowns(universe_id: int | None = None) -> list[Markdown]:
     conn = _get_conn()
     if universe_id is not None:
-        rows = conn.execute("SELECT * FROM markdowns WHERE pinned = 1 AND universe_id = ? ORDER BY updated_at DESC", (universe_id,)).fetchall()
+        rows = conn.execute(f"SELECT {_MARKDOWN_COLUMNS} FROM markdowns WHERE pinned = 1 AND universe_id = ? ORDER BY updated_at DESC", (universe_id,))
     else:
-        rows = conn.execute("SELECT * FROM markdowns WHERE pinned = 1 ORDER BY updated_at DESC").fetchall()
+        rows = conn.execute(f"SELECT {_MARKDOWN_COLUMNS} FROM markdowns WHERE pinned = 1 ORDER BY updated_at DESC")
+    markdowns = list(map(_row_to_markdown, rows))
     conn.close()
-    return [_row_to_markdown(r) for r in rows]
+    return markdowns
 
 
 def set_document_pinned(path: str, pinned: bool, universe_id: int = 1) -> None:
@@ -863,8 +985,10 @@ def get_document_paths_for_category(category_id: int) -> set[str]:
     """Return all document paths assigned to category_id or its descendants."""
     ids = get_descendant_ids(category_id)
     conn = _get_conn()
-    placeholders = ",".join("?" * len(ids))
-    rows = conn.execute(f"SELECT path FROM document_meta WHERE category_id IN ({placeholders})", list(ids)).fetchall()
+    rows = conn.execute(
+        "SELECT path FROM document_meta WHERE category_id IN (SELECT value FROM json_each(?))",
+        (json.dumps(sorted(ids)),),
+    ).fetchall()
     conn.close()
     return {r["path"] for r in rows}
 
@@ -872,18 +996,13 @@ def get_document_paths_for_category(category_id: int) -> set[str]:
 # ── Links CRUD ────────────────────────────────────────────────────────────
 
 
+# Selected in Link field order so rows unpack by position
+_LINK_COLUMNS = "id, title, url, category_id, pinned, created_at, updated_at, universe_id, sort_order"
+
+
 def _row_to_bookmark(row: sqlite3.Row) -> Link:
-    return Link(
-        id=row["id"],
-        title=row["title"],
-        url=row["url"],
-        category_id=row["category_id"],
-        pinned=bool(row["pinned"]),
-        created_at=row["created_at"],
-        updated_at=row["updated_at"],
-        universe_id=row["universe_id"],
-        sort_order=int(row["sort_order"]) if "sort_order" in row.keys() else 0,
-    )
+    lid, title, url, category_id, pinned, created_at, updated_at, universe_id, sort_order = row
+    return Link(lid, title, url, category_id, bool(pinned), created_at, updated_at, universe_id, int(sort_order))
 
 
 def _next_link_sort_order(conn: sqlite3.Connection, universe_id: int) -> int:
@@ -901,26 +1020,29 @@ def list_links(query: str = "", category_id: int | None = None, universe_id: int
     if universe_id is not None:
         conditions.append("universe_id = ?")
         params.append(universe_id)
-    if query:
+    if len(query) >= 3:
+        conditions.append("id IN (SELECT rowid FROM links_fts WHERE links_fts MATCH ?)")
+        params.append(_fts_phrase(query))
+    elif query:
         conditions.append("(title LIKE ? OR url LIKE ?)")
         params += [f"%{query}%", f"%{query}%"]
     if category_id is not None:
         ids = get_descendant_ids(category_id)
-        placeholders = ",".join("?" * len(ids))
-        conditions.append(f"category_id IN ({placeholders})")
-        params.extend(ids)
+        conditions.append("category_id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps(sorted(ids)))
     where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
     rows = conn.execute(
-        f"SELECT * FROM links{where} ORDER BY sort_order ASC, id ASC",
+        f"SELECT {_LINK_COLUMNS} FROM links{where} ORDER BY sort_order ASC, id ASC",
         params,
-    ).fetchall()
+    )
+    links = list(map(_row_to_bookmark, rows))
     conn.close()
-    return [_row_to_bookmark(r) for r in rows]
+    return links
 
 
 def get_link(link_id: int) -> Link | None:
     conn = _get_conn()
-    row = conn.execute("SELECT * FROM links WHERE id = ?", (link_id,)).fetchone()
+    row = conn.execute(f"SELECT {_LINK_COLUMNS} FROM links WHERE id = ?", (link_id,)).fetchone()
     conn.close()
     return _row_to_bookmark(row) if row else None
 
@@ -936,21 +1058,22 @@ def create_link(title: str, url: str, category_id: int | None = None, universe_i
     conn.commit()
     lid = cur.lastrowid
     conn.close()
-    return get_link(lid)  # type: ignore[return-value]
+    return Link(
+        id=lid, title=title, url=url, category_id=category_id, pinned=False,
+        created_at=now, updated_at=now, universe_id=universe_id, sort_order=sort_order,
+    )
 
 
 def update_link(link_id: int, title: str, url: str, category_id: int | None = None) -> Link | None:
     now = _now()
     conn = _get_conn()
-    cur = conn.execute(
-        "UPDATE links SET title = ?, url = ?, category_id = ?, updated_at = ? WHERE id = ?",
+    row = conn.execute(
+        f"UPDATE links SET title = ?, url = ?, category_id = ?, updated_at = ? WHERE id = ? RETURNING {_LINK_COLUMNS}",
         (title, url, category_id, now, link_id),
-    )
+    ).fetchone()
     conn.commit()
     conn.close()
-    if cur.rowcount == 0:
-        return None
-    return get_link(link_id)
+    return _row_to_bookmark(row) if row else None
 
 
 def delete_link(link_id: int) -> bool:
@@ -1000,19 +1123,20 @@ def list_pinned_links(universe_id: int | None = None) -> list[Link]:
     conn = _get_conn()
     if universe_id is not None:
         rows = conn.execute(
-            "SELECT * FROM links WHERE pinned = 1 AND universe_id = ? ORDER BY sort_order ASC, id ASC",
+            f"SELECT {_LINK_COLUMNS} FROM links WHERE pinned = 1 AND universe_id = ? ORDER BY sort_order ASC, id ASC",
             (universe_id,),
-        ).fetchall()
+        )
     else:
         rows = conn.execute(
-            "SELECT * FROM links WHERE pinned = 1 ORDER BY universe_id, sort_order ASC, id ASC"
-        ).fetchall()
+            f"SELECT {_LINK_COLUMNS} FROM links WHERE pinned = 1 ORDER BY universe_id, sort_order ASC, id ASC"
+        )
+    links = list(map(_row_to_bookmark, rows))
     conn.close()
-    return [_row_to_bookmark(r) for r in rows]
+    return links
 
 
 def link_to_dict(link: Link) -> dict:
-    return asdict(link)
+    return vars(link).copy()
 
 
 # ── Markdown images ────────────────────────────────────────────────────────
@@ -1030,29 +1154,63 @@ def _row_to_image(row: sqlite3.Row) -> MarkdownImage:
 
 def add_markdown_image(markdown_id: int, original_name: str, data: bytes) -> MarkdownImage:
     """Save image bytes to disk and record in DB."""
+    return add_markdown_images(markdown_id, [(original_name, data)])[0]
+
+
+def add_markdown_images(markdown_id: int, files: list[tuple[str, bytes]]) -> list[MarkdownImage]:
+    """Save several (original_name, bytes) images to disk and record them in one commit."""
+    if not files:
+        return []
     IMAGES_DIR.mkdir(parents=True, exist_ok=True)
-    ext = Path(original_name).suffix.lower() or ".png"
-    filename = f"{uuid.uuid4().hex}{ext}"
-    (IMAGES_DIR / filename).write_bytes(data)
+    filenames = [f"{uuid.uuid4().hex}{Path(name).suffix.lower() or '.png'}" for name, _ in files]
+
+    def write(i: int) -> None:
+        (IMAGES_DIR / filenames[i]).write_bytes(files[i][1])
+
+    if len(files) == 1:
+        write(0)
+    else:
+        with ThreadPoolExecutor(max_workers=min(8, len(files))) as pool:
+            list(pool.map(write, range(len(files))))
+
     now = _now()
     conn = _get_conn()
-    cur = conn.execute(
-        "INSERT INTO markdown_images (markdown_id, filename, original_name, created_at) VALUES (?, ?, ?, ?)",
-        (markdown_id, filename, original_name, now),
-    )
+    images = []
+    for filename, (original_name, _) in zip(filenames, files):
+        cur = conn.execute(
+            "INSERT INTO markdown_images (markdown_id, filename, original_name, created_at) VALUES (?, ?, ?, ?)",
+            (markdown_id, filename, original_name, now),
+        )
+        images.append(
+            MarkdownImage(id=cur.lastrowid, markdown_id=markdown_id, filename=filename, original_name=original_name, created_at=now)
+        )
     conn.commit()
-    img_id = cur.lastrowid
     conn.close()
-    return MarkdownImage(id=img_id, markdown_id=markdown_id, filename=filename, original_name=original_name, created_at=now)
+    return images
 
 
 def list_markdown_images(markdown_id: int) -> list[MarkdownImage]:
     conn = _get_conn()
     rows = conn.execute(
         "SELECT * FROM markdown_images WHERE markdown_id = ? ORDER BY created_at", (markdown_id,)
-    ).fetchall()
+    )
+    images = list(map(_row_to_image, rows))
     conn.close()
-    return [_row_to_image(r) for r in rows]
+    return images
+
+
+def _unlink_images(filenames: list[str]) -> None:
+    """Remove image files whose rows are already deleted (missing files are fine)."""
+
+    def unlink(filename: str) -> None:
+        (IMAGES_DIR / filename).unlink(missing_ok=True)
+
+    if len(filenames) <= 1:
+        for filename in filenames:
+            unlink(filename)
+        return
+    with ThreadPoolExecutor(max_workers=min(8, len(filenames))) as pool:
+        list(pool.map(unlink, filenames))
 
 
 def delete_markdown_image(image_id: int) -> bool:
@@ -1061,52 +1219,65 @@ def delete_markdown_image(image_id: int) -> bool:
     if not row:
         conn.close()
         return False
-    filepath = IMAGES_DIR / row["filename"]
-    if filepath.is_file():
-        filepath.unlink()
     conn.execute("DELETE FROM markdown_images WHERE id = ?", (image_id,))
     conn.commit()
     conn.close()
+    _unlink_images([row["filename"]])
     return True
 
 
 def delete_all_markdown_images(markdown_id: int) -> int:
     """Delete all images for a markdown. Returns count removed."""
     conn = _get_conn()
-    rows = conn.execute("SELECT filename FROM markdown_images WHERE markdown_id = ?", (markdown_id,)).fetchall()
-    for r in rows:
-        filepath = IMAGES_DIR / r["filename"]
-        if filepath.is_file():
-            filepath.unlink()
+    filenames = [
+        r["filename"]
+        for r in conn.execute("SELECT filename FROM markdown_images WHERE markdown_id = ?", (markdown_id,))
+    ]
     cur = conn.execute("DELETE FROM markdown_images WHERE markdown_id = ?", (markdown_id,))
     conn.commit()
     count = cur.rowcount
     conn.close()
+    _unlink_images(filenames)
     return count
 
 
 def markdown_image_to_dict(img: MarkdownImage) -> dict:
-    return asdict(img)
+    return vars(img).copy()
 
 
 # ── App settings ─────────────────────────────────────────────────────────
 
 
+# key -> stored value (None when unset).  Settings are read on every API
+# request; set_setting keeps this current and _sync_caches() drops it when
+# another connection has written to the database.
+_settings_cache: dict[str, str | None] = {}
+_settings_lock = threading.Lock()
+
+
 def get_setting(key: str, default: str = "") -> str:
     conn = _get_conn()
-    row = conn.execute("SELECT value FROM app_settings WHERE key = ?", (key,)).fetchone()
+    _sync_caches(conn)
+    try:
+        value = _settings_cache[key]
+    except KeyError:
+        with _settings_lock:
+            row = conn.execute("SELECT value FROM app_settings WHERE key = ?", (key,)).fetchone()
+            value = _settings_cache[key] = row["value"] if row else None
     conn.close()
-    return row["value"] if row else default
+    return default if value is None else value
 
 
 def set_setting(key: str, value: str) -> None:
-    conn = _get_conn()
-    conn.execute(
-        "INSERT INTO app_settings (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
-        (key, value),
-    )
-    conn.commit()
-    conn.close()
+    with _settings_lock:
+        conn = _get_conn()
+        conn.execute(
+            "INSERT INTO app_settings (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+        conn.commit()
+        conn.close()
+        _settings_cache[key] = value
 
 
 # ── Diagrams CRUD ─────────────────────────────────────────────────────────
@@ -1194,9 +1365,8 @@ def _diagrams_list_where(
         params.append(f"%{query}%")
     if category_id is not None:
         ids = get_descendant_ids(category_id)
-        placeholders = ",".join("?" * len(ids))
-        conditions.append(f"category_id IN ({placeholders})")
-        params.extend(ids)
+        conditions.append("category_id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps(sorted(ids)))
     where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
     return where, params
 
@@ -1204,9 +1374,10 @@ def _diagrams_list_where(
 def list_diagrams(query: str = "", category_id: int | None = None, universe_id: int | None = None) -> list[Diagram]:
     where, params = _diagrams_list_where(query, category_id, universe_id)
     conn = _get_conn()
-    rows = conn.execute(f"SELECT * FROM diagrams{where} ORDER BY updated_at DESC", params).fetchall()
+    rows = conn.execute(f"SELECT * FROM diagrams{where} ORDER BY updated_at DESC", params)
+    diagrams = list(map(_row_to_diagram, rows))
     conn.close()
-    return [_row_to_diagram(r) for r in rows]
+    return diagrams
 
 
 def list_diagram_summaries(query: str = "", category_id: int | None = None, universe_id: int | None = None) -> list[DiagramSummary]:
@@ -1215,9 +1386,10 @@ def list_diagram_summaries(query: str = "", category_id: int | None = None, univ
     rows = conn.execute(
         f"SELECT id, title, category_id, pinned, created_at, updated_at, universe_id FROM diagrams{where} ORDER BY updated_at DESC",
         params,
-    ).fetchall()
+    )
+    summaries = list(map(_row_to_diagram_summary, rows))
     conn.close()
-    return [_row_to_diagram_summary(r) for r in rows]
+    return summaries
 
 
 def get_diagram(diagram_id: int) -> Diagram | None:
@@ -1237,21 +1409,19 @@ def create_diagram(title: str, data: str = '{"type":"excalidraw","version":2,"so
     conn.commit()
     did = cur.lastrowid
     conn.close()
-    return get_diagram(did)  # type: ignore[return-value]
+    return Diagram(id=did, title=title, data=data, category_id=category_id, pinned=False, created_at=now, updated_at=now, universe_id=universe_id)
 
 
 def update_diagram(diagram_id: int, title: str, data: str, category_id: int | None = None) -> Diagram | None:
     now = _now()
     conn = _get_conn()
-    cur = conn.execute(
-        "UPDATE diagrams SET title = ?, data = ?, category_id = ?, updated_at = ? WHERE id = ?",
+    row = conn.execute(
+        "UPDATE diagrams SET title = ?, data = ?, category_id = ?, updated_at = ? WHERE id = ? RETURNING *",
         (title, data, category_id, now, diagram_id),
-    )
+    ).fetchone()
     conn.commit()
     conn.close()
-    if cur.rowcount == 0:
-        return None
-    return get_diagram(diagram_id)
+    return _row_to_diagram(row) if row else None
 
 
 def delete_diagram(diagram_id: int) -> bool:
@@ -1276,21 +1446,22 @@ def list_pinned_diagram_summaries(universe_id: int | None = None) -> list[Diagra
         rows = conn.execute(
             "SELECT id, title, category_id, pinned, created_at, updated_at, universe_id FROM diagrams WHERE pinned = 1 AND universe_id = ? ORDER BY updated_at DESC",
             (universe_id,),
-        ).fetchall()
+        )
     else:
         rows = conn.execute(
             "SELECT id, title, category_id, pinned, created_at, updated_at, universe_id FROM diagrams WHERE pinned = 1 ORDER BY updated_at DESC"
-        ).fetchall()
+        )
+    summaries = list(map(_row_to_diagram_summary, rows))
     conn.close()
-    return [_row_to_diagram_summary(r) for r in rows]
+    return summaries
 
 
 def diagram_to_dict(d: Diagram) -> dict:
-    return asdict(d)
+    return vars(d).copy()
 
 
 def diagram_summary_to_dict(d: DiagramSummary) -> dict:
-    return asdict(d)
+    return vars(d).copy()
 
 
 # ── Tables CRUD ──────────────────────────────────────────────────────────
@@ -1329,9 +1500,10 @@ def list_tables(query: str = "", category_id: int | None = None, universe_id: in
     if conditions:
         sql += " WHERE " + " AND ".join(conditions)
     sql += " ORDER BY pinned DESC, updated_at DESC"
-    rows = conn.execute(sql, params).fetchall()
+    rows = conn.execute(sql, params)
+    tables = list(map(_row_to_table, rows))
     conn.close()
-    return [_row_to_table(r) for r in rows]
+    return tables
 
 
 def get_table(table_id: int) -> Table | None:
@@ -1357,17 +1529,13 @@ def create_table(title: str, columns: str = "[]", category_id: int | None = None
 def update_table(table_id: int, title: str, columns: str, category_id: int | None = None) -> Table | None:
     now = _now()
     conn = _get_conn()
-    cur = conn.execute(
-        "UPDATE tables_ SET title = ?, columns = ?, category_id = ?, updated_at = ? WHERE id = ?",
+    row = conn.execute(
+        "UPDATE tables_ SET title = ?, columns = ?, category_id = ?, updated_at = ? WHERE id = ? RETURNING *",
         (title, columns, category_id, now, table_id),
-    )
+    ).fetchone()
     conn.commit()
-    if cur.rowcount == 0:
-        conn.close()
-        return None
-    row = conn.execute("SELECT * FROM tables_ WHERE id = ?", (table_id,)).fetchone()
     conn.close()
-    return _row_to_table(row)
+    return _row_to_table(row) if row else None
 
 
 def category_in_universe(category_id: int | None, universe_id: int) -> bool:
@@ -1497,15 +1665,16 @@ def set_table_pinned(table_id: int, pinned: bool) -> bool:
 def list_pinned_tables(universe_id: int | None = None) -> list[Table]:
     conn = _get_conn()
     if universe_id is not None:
-        rows = conn.execute("SELECT * FROM tables_ WHERE pinned = 1 AND universe_id = ? ORDER BY title", (universe_id,)).fetchall()
+        rows = conn.execute("SELECT * FROM tables_ WHERE pinned = 1 AND universe_id = ? ORDER BY title", (universe_id,))
     else:
-        rows = conn.execute("SELECT * FROM tables_ WHERE pinned = 1 ORDER BY title").fetchall()
+        rows = conn.execute("SELECT * FROM tables_ WHERE pinned = 1 ORDER BY title")
+    tables = list(map(_row_to_table, rows))
     conn.close()
-    return [_row_to_table(r) for r in rows]
+    return tables
 
 
 def table_to_dict(t: Table) -> dict:
-    return asdict(t)
+    return vars(t).copy()
 
 
 # ── Table rows CRUD ──────────────────────────────────────────────────────
@@ -1557,9 +1726,10 @@ def list_table_rows(
     rows = conn.execute(
         f"SELECT * {base} ORDER BY {order_sql} LIMIT ? OFFSET ?",
         params + order_extra + [page_size, offset],
-    ).fetchall()
+    )
+    table_rows = list(map(_row_to_table_row, rows))
     conn.close()
-    return [_row_to_table_row(r) for r in rows], total
+    return table_rows, total
 
 
 def list_all_table_rows(table_id: int) -> list[TableRow]:
@@ -1567,9 +1737,10 @@ def list_all_table_rows(table_id: int) -> list[TableRow]:
     rows = conn.execute(
         "SELECT * FROM table_rows WHERE table_id = ? ORDER BY sort_order, id",
         (table_id,),
-    ).fetchall()
+    )
+    table_rows = list(map(_row_to_table_row, rows))
     conn.close()
-    return [_row_to_table_row(r) for r in rows]
+    return table_rows
 
 
 def get_table_row(row_id: int) -> TableRow | None:
@@ -1629,7 +1800,7 @@ def delete_table_row(row_id: int) -> bool:
 
 
 def table_row_to_dict(r: TableRow) -> dict:
-    return asdict(r)
+    return vars(r).copy()
 
 
 # ── Agent Tasks (Slack delivery of markdown instructions) ─────────────────
@@ -1706,7 +1877,7 @@ def _compute_next_run_preview(t: AgentTask) -> str | None:
 
 
 def agent_task_to_dict(t: AgentTask, markdown_title: str | None = None) -> dict:
-    d = asdict(t)
+    d = vars(t).copy()
     d["next_run_at"] = _compute_next_run_preview(t)
     d["markdown_title"] = markdown_title
     return d
@@ -1718,11 +1889,12 @@ def list_agent_tasks(universe_id: int | None = None) -> list[AgentTask]:
         rows = conn.execute(
             "SELECT * FROM agent_tasks WHERE universe_id = ? ORDER BY title COLLATE NOCASE",
             (universe_id,),
-        ).fetchall()
+        )
     else:
-        rows = conn.execute("SELECT * FROM agent_tasks ORDER BY title COLLATE NOCASE").fetchall()
+        rows = conn.execute("SELECT * FROM agent_tasks ORDER BY title COLLATE NOCASE")
+    tasks = list(map(_row_to_agent_task, rows))
     conn.close()
-    return [_row_to_agent_task(r) for r in rows]
+    return tasks
 
 
 def get_agent_task(task_id: int) -> AgentTask | None:
@@ -15,6 +15,7 @@ Design goals:
   - Works across multiple deployed instances sharing the same DB file.
 """
 
+import functools
 import importlib
 import pkgutil
 import sqlite3
@@ -40,12 +41,73 @@ def get_current_version(conn: sqlite3.Connection) -> int:
     return row[0] or 0
 
 
-def discover_migrations() -> list[tuple[int, str, object]]:
+# Column catalog snapshot used while run_migrations is applying a batch:
+# table name -> column names, plus the PRAGMA schema_version it reflects.
+_columns: dict[str, set[str]] | None = None
+_columns_version = 0
+
+
+def _schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA schema_version").fetchone()[0]
+
+
+def _load_columns(conn: sqlite3.Connection) -> None:
+    """Snapshot every table's columns in one query."""
+    global _columns, _columns_version
+    columns: dict[str, set[str]] = {}
+    rows = conn.execute(
+        "SELECT m.name, p.name FROM sqlite_schema AS m, pragma_table_info(m.name) AS p "
+        "WHERE m.type = 'table'"
+    )
+    for table, column in rows:
+        columns.setdefault(table, set()).add(column)
+    _columns = columns
+    _columns_version = _schema_version(conn)
+
+
+def has_column(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    """Return True if ``table`` already has a column named ``column``.
+
+    During run_migrations this is answered from the runner's catalog
+    snapshot; tables created after the snapshot are looked up on demand,
+    and any other DDL since it was taken (schema_version moved) clears it.
+    """
+    global _columns_version
+    if _columns is None:
+        return any(r[1] == column for r in conn.execute(f"PRAGMA table_info({table})"))
+    version = _schema_version(conn)
+    if version != _columns_version:
+        _columns.clear()
+        _columns_version = version
+    if table not in _columns:
+        _columns[table] = {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+    return column in _columns[table]
+
+
+def add_column(conn: sqlite3.Connection, table: str, column: str, definition: str) -> None:
+    """Add a column if it doesn't already exist (idempotent).
+
+    Checks the table schema first instead of letting ALTER TABLE fail, so
+    re-runs neither parse a doomed statement nor raise and swallow an error.
+    """
+    global _columns_version
+    if has_column(conn, table, column):
+        return
+    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    if _columns is not None:
+        # has_column just synced the snapshot, so only this ALTER moved it on
+        _columns[table].add(column)
+        _columns_version = _schema_version(conn)
+
+
+@functools.lru_cache(maxsize=1)
+def discover_migrations() -> tuple[tuple[int, str, object], ...]:
     """Scan src.migrations for numbered migration modules.
 
-    Returns a sorted list of (version, name, module) tuples.
+    Returns a sorted tuple of (version, name, module) tuples.
     Module filenames must match the pattern NNN_description.py
-    (e.g. 001_baseline.py, 002_add_foo.py).
+    (e.g. 001_baseline.py, 002_add_foo.py).  The scan runs once per
+    process; migration modules don't change while the app is running.
     """
     import src.migrations as pkg
 
@@ -71,23 +133,49 @@ def discover_migrations() -> list[tuple[int, str, object]]:
             raise RuntimeError(f"Duplicate migration version {ver}: {name}")
         seen.add(ver)
 
-    return migrations
+    return tuple(migrations)
 
 
 def run_migrations(conn: sqlite3.Connection) -> int:
     """Apply any pending migrations and return the number applied.
 
     Acquires an EXCLUSIVE transaction lock so concurrent processes
-    don't race.  Migrations that are already applied are skipped.
+    don't race.  Migrations that are already applied are skipped, and
+    when the database is already current no lock is taken at all.
     """
+    global _columns, _columns_version
+    # journal_mode is persisted in the database file, so setting it once per
+    # process is enough.  Per-connection pragmas (synchronous, temp_store,
+    # busy_timeout) are the caller's, set in _get_conn().
+    conn.execute("PRAGMA journal_mode = WAL")
     _ensure_version_table(conn)
 
-    # Use EXCLUSIVE to serialize concurrent migration attempts
-    conn.execute("BEGIN EXCLUSIVE")
+    migrations = discover_migrations()
+    if not migrations or migrations[-1][0] <= get_current_version(conn):
+        return 0
+
+    # Table rebuilds and backfills touch many pages; give them room.  The
+    # connection is the caller's pooled one, so its own sizes are put back.
+    # (mmap_size returns no row where memory mapping is unavailable, e.g.
+    # for in-memory databases; such a pragma is left alone.)
+    sizes = {
+        pragma: row[0]
+        for pragma in ("cache_size", "mmap_size")
+        if (row := conn.execute(f"PRAGMA {pragma}").fetchone()) is not None
+    }
     try:
+        if "cache_size" in sizes:
+            conn.execute("PRAGMA cache_size = -65536")  # 64 MiB
+        if "mmap_size" in sizes:
+            conn.execute("PRAGMA mmap_size = 268435456")  # 256 MiB
+
+        # Use EXCLUSIVE to serialize concurrent migration attempts
+        conn.execute("BEGIN EXCLUSIVE")
+
+        # Re-read under the lock: another process may have migrated meanwhile
         current = get_current_version(conn)
-        migrations = discover_migrations()
         applied = 0
+        _load_columns(conn)
 
         for version, name, mod in migrations:
             if version <= current:
@@ -103,8 +191,14 @@ def run_migrations(conn: sqlite3.Connection) -> int:
         conn.commit()
 
         if applied:
+            # Refresh planner statistics for the tables and indexes just changed
+            conn.execute("PRAGMA optimize")
             print(f"[migrate] Done — applied {applied} migration(s), now at v{current + applied}.")
         return applied
     except Exception:
         conn.rollback()
         raise
+    finally:
+        _columns = None
+        for pragma, value in sizes.items():
+            conn.execute(f"PRAGMA {pragma} = {int(value)}")
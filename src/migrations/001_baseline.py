@@ -2,7 +2,7 @@
 
 For NEW databases: creates all tables from scratch.
 For EXISTING databases: tables already exist (CREATE IF NOT EXISTS is idempotent),
-  and the ad-hoc ALTER TABLE migrations are re-applied safely via try/except.
+  and the ad-hoc ALTER TABLE migrations are skipped for columns that already exist.
 
 After this migration, the database is at a known-good state and all future
 changes go through numbered migration files.
@@ -10,6 +10,8 @@ changes go through numbered migration files.
 
 import sqlite3
 
+from src.migrate import add_column, has_column
+
 
 def up(conn: sqlite3.Connection) -> None:
     # ── Categories ────────────────────────────────────────────
@@ -38,8 +40,8 @@ def up(conn: sqlite3.Connection) -> None:
         """
     )
     # Legacy migrations — safe to re-run (no-op if columns exist)
-    _add_column(conn, "notes", "category_id", "INTEGER REFERENCES categories(id) ON DELETE SET NULL")
-    _add_column(conn, "notes", "pinned", "INTEGER NOT NULL DEFAULT 0")
+    add_column(conn, "notes", "category_id", "INTEGER REFERENCES categories(id) ON DELETE SET NULL")
+    add_column(conn, "notes", "pinned", "INTEGER NOT NULL DEFAULT 0")
 
     # ── Document meta ─────────────────────────────────────────
     conn.execute(
@@ -51,8 +53,8 @@ def up(conn: sqlite3.Connection) -> None:
         )
         """
     )
-    _add_column(conn, "document_meta", "category_id", "INTEGER REFERENCES categories(id) ON DELETE SET NULL")
-    _add_column(conn, "document_meta", "pinned", "INTEGER NOT NULL DEFAULT 0")
+    add_column(conn, "document_meta", "category_id", "INTEGER REFERENCES categories(id) ON DELETE SET NULL")
+    add_column(conn, "document_meta", "pinned", "INTEGER NOT NULL DEFAULT 0")
 
     # ── Action items ──────────────────────────────────────────
     conn.execute(
@@ -69,7 +71,7 @@ def up(conn: sqlite3.Connection) -> None:
         )
         """
     )
-    _add_column(conn, "action_items", "category_id", "INTEGER REFERENCES categories(id) ON DELETE SET NULL")
+    add_column(conn, "action_items", "category_id", "INTEGER REFERENCES categories(id) ON DELETE SET NULL")
 
     # ── Note images ───────────────────────────────────────────
     conn.execute(
@@ -130,18 +132,9 @@ def up(conn: sqlite3.Connection) -> None:
 # ── Helpers ──────────────────────────────────────────────────
 
 
-def _add_column(conn: sqlite3.Connection, table: str, column: str, definition: str) -> None:
-    """Add a column if it doesn't already exist (idempotent)."""
-    try:
-        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
-    except sqlite3.OperationalError:
-        pass  # column already exists
-
-
 def _migrate_text_categories(conn: sqlite3.Connection) -> None:
     """One-time migration from text 'category' column to category_id FK."""
-    cols = [r[1] for r in conn.execute("PRAGMA table_info(notes)").fetchall()]
-    if "category" not in cols:
+    if not has_column(conn, "notes", "category"):
         return
 
     rows = conn.execute(
@@ -149,8 +142,8 @@ def _migrate_text_categories(conn: sqlite3.Connection) -> None:
     ).fetchall()
     text_cats = [r[0] for r in rows]
 
-    dm_cols = [r[1] for r in conn.execute("PRAGMA table_info(document_meta)").fetchall()]
-    if "category" in dm_cols:
+    dm_has_category = has_column(conn, "document_meta", "category")
+    if dm_has_category:
         rows2 = conn.execute(
             "SELECT DISTINCT category FROM document_meta WHERE category != '' AND category IS NOT NULL"
         ).fetchall()
@@ -170,15 +163,14 @@ def _migrate_text_categories(conn: sqlite3.Connection) -> None:
                 cur = conn.execute("INSERT INTO categories (name, parent_id) VALUES (?, NULL)", (name,))
                 cat_map[name] = cur.lastrowid
 
-        for text, cat_id in cat_map.items():
-            conn.execute(
-                "UPDATE notes SET category_id = ? WHERE category = ? AND (category_id IS NULL OR category_id = 0)",
-                (cat_id, text),
-            )
+        params = [(cat_id, text) for text, cat_id in cat_map.items()]
+        conn.executemany(
+            "UPDATE notes SET category_id = ? WHERE category = ? AND (category_id IS NULL OR category_id = 0)",
+            params,
+        )
 
-        if "category" in dm_cols:
-            for text, cat_id in cat_map.items():
-                conn.execute(
-                    "UPDATE document_meta SET category_id = ? WHERE category = ? AND (category_id IS NULL OR category_id = 0)",
-                    (cat_id, text),
-                )
+        if dm_has_category:
+            conn.executemany(
+                "UPDATE document_meta SET category_id = ? WHERE category = ? AND (category_id IS NULL OR category_id = 0)",
+                params,
+            )
@@ -7,6 +7,8 @@ are replaced by explicit tasks.
 
 import sqlite3
 
+from src.migrate import add_column
+
 
 def up(conn: sqlite3.Connection) -> None:
     conn.execute(
@@ -22,21 +24,16 @@ def up(conn: sqlite3.Connection) -> None:
     )
 
     # Migrate any existing activity_members rows into activity_tasks
-    rows = conn.execute(
-        "SELECT activity_id, member_id, position FROM activity_members ORDER BY activity_id, position"
-    ).fetchall()
-    for r in rows:
-        conn.execute(
-            "INSERT INTO activity_tasks (activity_id, member_id, instruction, position) VALUES (?, ?, '', ?)",
-            (r["activity_id"], r["member_id"], r["position"]),
-        )
+    conn.execute(
+        """
+        INSERT INTO activity_tasks (activity_id, member_id, instruction, position)
+        SELECT activity_id, member_id, '', position
+        FROM activity_members
+        ORDER BY activity_id, position
+        """
+    )
 
     conn.execute("DROP TABLE IF EXISTS activity_members")
 
     # Add task_id column to activity_responses
-    try:
-        conn.execute(
-            "ALTER TABLE activity_responses ADD COLUMN task_id INTEGER REFERENCES activity_tasks(id) ON DELETE SET NULL"
-        )
-    except sqlite3.OperationalError:
-        pass  # already exists
+    add_column(conn, "activity_responses", "task_id", "INTEGER REFERENCES activity_tasks(id) ON DELETE SET NULL")
@@ -2,11 +2,8 @@
 
 import sqlite3
 
+from src.migrate import add_column
+
 
 def up(conn: sqlite3.Connection) -> None:
-    try:
-        conn.execute(
-            "ALTER TABLE activity_runs ADD COLUMN model TEXT NOT NULL DEFAULT ''"
-        )
-    except sqlite3.OperationalError:
-        pass  # already exists
+    add_column(conn, "activity_runs", "model", "TEXT NOT NULL DEFAULT ''")
@@ -2,8 +2,8 @@
 
 import sqlite3
 
+from src.migrate import add_column
+
 
 def up(conn: sqlite3.Connection) -> None:
-    conn.execute(
-        "ALTER TABLE team_members ADD COLUMN agent_name TEXT NOT NULL DEFAULT ''"
-    )
+    add_column(conn, "team_members", "agent_name", "TEXT NOT NULL DEFAULT ''")
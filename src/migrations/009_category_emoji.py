@@ -2,9 +2,8 @@
 
 import sqlite3
 
+from src.migrate import add_column
+
 
 def up(conn: sqlite3.Connection) -> None:
-    try:
-        conn.execute("ALTER TABLE categories ADD COLUMN emoji TEXT DEFAULT NULL")
-    except sqlite3.OperationalError:
-        pass
+    add_column(conn, "categories", "emoji", "TEXT DEFAULT NULL")
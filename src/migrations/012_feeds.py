@@ -12,6 +12,7 @@ def up(conn: sqlite3.Connection) -> None:
             category_id INTEGER REFERENCES categories(id) ON DELETE SET NULL,
             universe_id INTEGER NOT NULL DEFAULT 1,
             api_key     TEXT NOT NULL,
+            pinned      INTEGER NOT NULL DEFAULT 0,
             created_at  TEXT NOT NULL,
             updated_at  TEXT NOT NULL
         )
@@ -34,8 +35,3 @@ def up(conn: sqlite3.Connection) -> None:
     conn.execute(
         "CREATE INDEX IF NOT EXISTS idx_feed_artifacts_feed ON feed_artifacts(feed_id)"
     )
-    # Idempotent column add for pinned
-    try:
-        conn.execute("ALTER TABLE feeds ADD COLUMN pinned INTEGER NOT NULL DEFAULT 0")
-    except Exception:
-        pass
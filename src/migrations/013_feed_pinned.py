@@ -2,9 +2,8 @@
 
 import sqlite3
 
+from src.migrate import add_column
+
 
 def up(conn: sqlite3.Connection) -> None:
-    try:
-        conn.execute("ALTER TABLE feeds ADD COLUMN pinned INTEGER NOT NULL DEFAULT 0")
-    except Exception:
-        pass
+    add_column(conn, "feeds", "pinned", "INTEGER NOT NULL DEFAULT 0")
@@ -2,9 +2,8 @@
 
 import sqlite3
 
+from src.migrate import add_column
+
 
 def up(conn: sqlite3.Connection) -> None:
-    try:
-        conn.execute("ALTER TABLE scheduled_messages ADD COLUMN title TEXT NOT NULL DEFAULT ''")
-    except Exception:
-        pass
+    add_column(conn, "scheduled_messages", "title", "TEXT NOT NULL DEFAULT ''")
@@ -2,9 +2,8 @@
 
 import sqlite3
 
+from src.migrate import add_column
+
 
 def up(conn: sqlite3.Connection) -> None:
-    try:
-        conn.execute("ALTER TABLE feed_artifacts ADD COLUMN read INTEGER NOT NULL DEFAULT 0")
-    except sqlite3.OperationalError:
-        pass
+    add_column(conn, "feed_artifacts", "read", "INTEGER NOT NULL DEFAULT 0")
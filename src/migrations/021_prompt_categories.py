@@ -2,6 +2,8 @@
 
 import sqlite3
 
+from src.migrate import add_column
+
 
 def up(conn: sqlite3.Connection) -> None:
     conn.execute(
@@ -15,11 +17,5 @@ def up(conn: sqlite3.Connection) -> None:
         )
         """
     )
-    try:
-        conn.execute("ALTER TABLE prompts ADD COLUMN category_id INTEGER REFERENCES prompt_categories(id) ON DELETE SET NULL")
-    except Exception:
-        pass
-    try:
-        conn.execute("ALTER TABLE prompts ADD COLUMN sort_order INTEGER NOT NULL DEFAULT 0")
-    except Exception:
-        pass
+    add_column(conn, "prompts", "category_id", "INTEGER REFERENCES prompt_categories(id) ON DELETE SET NULL")
+    add_column(conn, "prompts", "sort_order", "INTEGER NOT NULL DEFAULT 0")
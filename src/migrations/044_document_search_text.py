@@ -2,9 +2,8 @@
 
 import sqlite3
 
+from src.migrate import add_column
+
 
 def up(conn: sqlite3.Connection) -> None:
-    try:
-        conn.execute("ALTER TABLE document_meta ADD COLUMN search_text TEXT")
-    except sqlite3.OperationalError:
-        pass
+    add_column(conn, "document_meta", "search_text", "TEXT")
@@ -0,0 +1,28 @@
+"""Index foreign-key columns that had none.
+
+SQLite does not index FK columns automatically, so ON DELETE CASCADE /
+SET NULL from the parent row scans the whole child table, as do the
+per-parent listings of markdown images and table rows.
+"""
+
+import sqlite3
+
+
+def up(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_activity_tasks_activity_position "
+        "ON activity_tasks(activity_id, position)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_activity_tasks_member ON activity_tasks(member_id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_markdown_images_markdown "
+        "ON markdown_images(markdown_id, created_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_agent_tasks_markdown ON agent_tasks(markdown_id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_table_rows_table ON table_rows(table_id, sort_order, id)"
+    )
@@ -0,0 +1,71 @@
+"""Index the filter + sort columns of the list_* queries.
+
+Content listings filter on universe_id (and pinned, for the pinned
+panels) and sort on updated_at or sort_order; without these they scan
+and sort the whole table.  The pinned indexes are partial, so they only
+hold the handful of pinned rows.  categories(parent_id) serves the
+recursive descendant walk, and the category_id indexes serve the
+category filters and ON DELETE SET NULL when a category is removed.
+"""
+
+import sqlite3
+
+
+def up(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_markdowns_universe_updated "
+        "ON markdowns(universe_id, updated_at DESC)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_markdowns_pinned "
+        "ON markdowns(universe_id, updated_at DESC) WHERE pinned = 1"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_markdowns_category ON markdowns(category_id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_links_universe_order "
+        "ON links(universe_id, sort_order, id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_links_pinned "
+        "ON links(universe_id, sort_order, id) WHERE pinned = 1"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_links_category ON links(category_id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_diagrams_universe_updated "
+        "ON diagrams(universe_id, updated_at DESC)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_diagrams_pinned "
+        "ON diagrams(universe_id, updated_at DESC) WHERE pinned = 1"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_diagrams_category ON diagrams(category_id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tables_universe_updated "
+        "ON tables_(universe_id, pinned DESC, updated_at DESC)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tables_category ON tables_(category_id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_categories_parent ON categories(parent_id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_categories_universe_order "
+        "ON categories(universe_id, sort_order, name)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_document_meta_universe ON document_meta(universe_id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_document_meta_category ON document_meta(category_id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_document_meta_pinned "
+        "ON document_meta(universe_id) WHERE pinned = 1"
+    )
@@ -0,0 +1,48 @@
+"""Full-text indexes for markdown and link search.
+
+External-content FTS5 tables over markdowns(title, body) and
+links(title, url), kept in sync by triggers.  The trigram tokenizer keeps
+the substring, case-insensitive semantics of the LIKE '%q%' filters they
+replace (for queries of three or more characters).
+"""
+
+import sqlite3
+
+
+def _add_fts(conn: sqlite3.Connection, table: str, columns: tuple[str, str]) -> None:
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_cols = ", ".join(f"new.{c}" for c in columns)
+    old_cols = ", ".join(f"old.{c}" for c in columns)
+    conn.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', tokenize='trigram')"
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_cols});
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+            INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_cols});
+        END
+        """
+    )
+    conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+def up(conn: sqlite3.Connection) -> None:
+    _add_fts(conn, "markdowns", ("title", "body"))
+    _add_fts(conn, "links", ("title", "url"))
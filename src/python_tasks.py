@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
 from src.markdowns import _get_conn, _now
@@ -94,7 +94,7 @@ def _normalize_timeout(timeout_seconds: int) -> int:
 
 
 def python_task_to_dict(t: PythonTask, script_title: str | None = None) -> dict:
-    d = asdict(t)
+    d = vars(t).copy()
     d["next_run_at"] = _compute_next_run_preview(t)
     d["script_title"] = script_title
     return d
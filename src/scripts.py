@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+import json
+from dataclasses import dataclass
 
 from src.markdowns import (
     _get_conn,
@@ -53,7 +54,7 @@ def _row_to_script(row) -> Script:
 
 
 def script_to_dict(s: Script) -> dict:
-    return asdict(s)
+    return vars(s).copy()
 
 
 def _list_where(
@@ -71,9 +72,8 @@ def _list_where(
         params.extend([f"%{query}%", f"%{query}%"])
     if category_id is not None:
         ids = get_descendant_ids(category_id)
-        placeholders = ",".join("?" * len(ids))
-        conditions.append(f"category_id IN ({placeholders})")
-        params.extend(ids)
+        conditions.append("category_id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps(sorted(ids)))
     where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
     return where, params
 
@@ -10,19 +10,17 @@ from typing import Any
 
 import requests
 
+from src.markdowns import get_setting
+
 SLACK_API = "https://slack.com/api"
 MAX_MESSAGE_LEN = 4000
 
 
 def get_bot_token() -> str:
-    from src.markdowns import get_setting
-
     return (os.environ.get("SLACK_BOT_TOKEN") or get_setting("slack_bot_token") or "").strip()
 
 
 def get_default_channel_id() -> str:
-    from src.markdowns import get_setting
-
     return (
         os.environ.get("SLACK_DEFAULT_CHANNEL_ID")
         or get_setting("slack_default_channel_id")
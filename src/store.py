@@ -1,7 +1,9 @@
 """ChromaDB vector store management."""
 
+import functools
 import shutil
 import threading
+from collections import OrderedDict
 from pathlib import Path
 
 from langchain_chroma import Chroma
@@ -15,13 +17,27 @@ _store_lock = threading.Lock()
 
 INDEXED_CONTENT_TYPES = ("markdown", "script", "link", "diagram", "table")
 
+# (query, k, universe_id) -> search_content results, least recently used first.
+# Filled and cleared only under _store_lock, so results never outlive a write.
+_search_cache: OrderedDict[tuple[str, int, int | None], list[dict]] = OrderedDict()
+_search_cache_lock = threading.Lock()
+_SEARCH_CACHE_SIZE = 256
 
+
+def _store_changed() -> None:
+    """Call with _store_lock held after modifying the collection."""
+    with _search_cache_lock:
+        _search_cache.clear()
+
+
+@functools.lru_cache(maxsize=1)
 def _embeddings() -> FastEmbedEmbeddings:
     return FastEmbedEmbeddings(model_name="BAAI/bge-small-en-v1.5")
 
 
+@functools.lru_cache(maxsize=1)
 def get_vectorstore() -> Chroma:
-    """Return the persistent Chroma vector store."""
+    """Return the persistent Chroma vector store (built once per process)."""
     return Chroma(
         collection_name=COLLECTION,
         embedding_function=_embeddings(),
@@ -29,6 +45,13 @@ def get_vectorstore() -> Chroma:
     )
 
 
+def reset_vectorstore() -> None:
+    """Drop the cached store and search results, e.g. after the Chroma files were replaced."""
+    with _store_lock:
+        get_vectorstore.cache_clear()
+        _store_changed()
+
+
 def _item_doc_id(content_type: str, item_id: int) -> str:
     return f"{content_type}-{item_id}"
 
@@ -41,6 +64,7 @@ def add_documents(documents: list[Document], universe_id: int = 1) -> int:
     with _store_lock:
         store = get_vectorstore()
         store.add_documents(documents)
+        _store_changed()
     return len(documents)
 
 
@@ -92,6 +116,7 @@ def upsert_item(
                     metadata[key] = val
         doc = Document(page_content=content, metadata=metadata)
         store.add_documents([doc], ids=[doc_id])
+        _store_changed()
     print(
         f"[Astro] Upserted {content_type} id={item_id} title={title!r} "
         f"universe={universe_id} len={len(content)}"
@@ -106,6 +131,7 @@ def delete_item(content_type: str, item_id: int) -> None:
             store._collection.delete(ids=[_item_doc_id(content_type, item_id)])
         except Exception:
             pass
+        _store_changed()
 
 
 def upsert_markdown(markdown_id: int, content: str, title: str, universe_id: int = 1) -> None:
@@ -128,6 +154,7 @@ def delete_document_chunks(source_path: str) -> int:
         ids = results.get("ids", [])
         if ids:
             collection.delete(ids=ids)
+            _store_changed()
     return len(ids)
 
 
@@ -161,17 +188,8 @@ def _title_from_metadata(meta: dict) -> str:
     return "Untitled"
 
 
-def search_content(query: str, k: int = 20, universe_id: int | None = None) -> list[dict]:
-    """Semantic search with deduplicated, structured results."""
-    k = max(1, min(k, 50))
-    fetch_k = min(k * 4, 100)
-    with _store_lock:
-        store = get_vectorstore()
-        kwargs: dict = {"k": fetch_k}
-        if universe_id is not None:
-            kwargs["filter"] = {"universe_id": universe_id}
-        pairs = store.similarity_search_with_score(query, **kwargs)
-
+def _search_hits(pairs: list[tuple[Document, float]], k: int) -> list[dict]:
+    """Deduplicate scored chunks into at most k structured results."""
     seen: set[str] = set()
     results: list[dict] = []
     for doc, score in pairs:
@@ -210,6 +228,36 @@ def search_content(query: str, k: int = 20, universe_id: int | None = None) -> l
     return results
 
 
+def search_content(query: str, k: int = 20, universe_id: int | None = None) -> list[dict]:
+    """Semantic search with deduplicated, structured results."""
+    k = max(1, min(k, 50))
+    cache_key = (query, k, universe_id)
+    with _search_cache_lock:
+        cached = _search_cache.get(cache_key)
+        if cached is not None:
+            _search_cache.move_to_end(cache_key)
+            return list(cached)
+    fetch_k = min(k * 4, 100)
+    with _store_lock:
+        # Identical searches queue on the lock; all but the first find the
+        # results the first one cached and skip embedding the query again.
+        with _search_cache_lock:
+            cached = _search_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        store = get_vectorstore()
+        kwargs: dict = {"k": fetch_k}
+        if universe_id is not None:
+            kwargs["filter"] = {"universe_id": universe_id}
+        pairs = store.similarity_search_with_score(query, **kwargs)
+        results = _search_hits(pairs, k)
+        with _search_cache_lock:
+            _search_cache[cache_key] = results
+            if len(_search_cache) > _SEARCH_CACHE_SIZE:
+                _search_cache.popitem(last=False)
+    return list(results)
+
+
 def clear() -> None:
     """Delete all data from the vector store collection."""
     with _store_lock:
@@ -220,4 +268,5 @@ def clear() -> None:
             if not batch["ids"]:
                 break
             collection.delete(ids=batch["ids"])
+    reset_vectorstore()
     print("Vector store cleared.")
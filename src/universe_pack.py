@@ -15,7 +15,7 @@ from src.ingest import SUPPORTED_EXTENSIONS, chunk_documents, load_document
 from src.markdowns import (
     DB_PATH,
     IMAGES_DIR,
-    add_markdown_image,
+    add_markdown_images,
     create_category,
     create_diagram,
     create_link,
@@ -389,7 +389,7 @@ def import_universe_bundle(zip_path: Path, new_universe_name: str) -> int:
                 set_markdown_pinned(md.id, True)
             schedule_reindex("markdown", md.id)
 
-        filename_map: dict[str, str] = {}
+        images_by_md: dict[int, list[tuple[str, str, bytes]]] = {}
         for im in manifest.get("markdown_images") or []:
             m_old = int(im["markdown_old_id"])
             if m_old not in md_old_to_new:
@@ -401,8 +401,13 @@ def import_universe_bundle(zip_path: Path, new_universe_name: str) -> int:
                 data = zf.read(zpath)
             except KeyError:
                 continue
-            added = add_markdown_image(mid_new, im.get("original_name") or "image.png", data)
-            filename_map[old_fn] = added.filename
+            images_by_md.setdefault(mid_new, []).append((old_fn, im.get("original_name") or "image.png", data))
+
+        filename_map: dict[str, str] = {}
+        for mid_new, images in images_by_md.items():
+            added = add_markdown_images(mid_new, [(name, data) for _, name, data in images])
+            for (old_fn, _, _), img in zip(images, added):
+                filename_map[old_fn] = img.filename
 
         for m in manifest.get("markdowns") or []:
             oid = int(m["id"])